@@ -6,35 +6,31 @@
 import sys
 from fetch_gov_news import fetch_and_add_gov_news
 from fetch_rthk_news import fetch_and_add_rthk_news
+from fetch_telegram import fetch_and_add_telegram
+
+# 按順序執行的任務：(名稱, 函數)
+TASKS = [
+    ('政府新聞', fetch_and_add_gov_news),
+    ('RTHK 新聞', fetch_and_add_rthk_news),
+    ('Telegram 頻道', fetch_and_add_telegram),
+]
 
 
 def main():
     """執行所有新聞獲取任務"""
     results = []
     
-    # 獲取政府新聞
-    print("=" * 60)
-    print("開始獲取政府新聞...")
-    print("=" * 60)
-    try:
-        gov_result = fetch_and_add_gov_news()
-        results.append(('政府新聞', gov_result))
-    except Exception as e:
-        print(f"❌ 獲取政府新聞失敗: {str(e)}")
-        results.append(('政府新聞', {'success': False, 'error': str(e)}))
-    
-    print("\n")
-    
-    # 獲取 RTHK 新聞
-    print("=" * 60)
-    print("開始獲取 RTHK 新聞...")
-    print("=" * 60)
-    try:
-        rthk_result = fetch_and_add_rthk_news()
-        results.append(('RTHK 新聞', rthk_result))
-    except Exception as e:
-        print(f"❌ 獲取 RTHK 新聞失敗: {str(e)}")
-        results.append(('RTHK 新聞', {'success': False, 'error': str(e)}))
+    for index, (name, task) in enumerate(TASKS):
+        if index > 0:
+            print("\n")
+        print("=" * 60)
+        print(f"開始獲取{name}...")
+        print("=" * 60)
+        try:
+            results.append((name, task()))
+        except Exception as e:
+            print(f"❌ 獲取{name}失敗: {str(e)}")
+            results.append((name, {'success': False, 'error': str(e)}))
     
     # 輸出總結
     print("\n" + "=" * 60)
@@ -45,6 +41,9 @@ def main():
             print(f"✅ {name}: {result.get('message', '成功')}")
         else:
             print(f"❌ {name}: {result.get('error', '失敗')}")
+        queue = result.get('queue')
+        if queue:
+            print(f"   🔁 重試隊列: 待重試 {queue['pending']} 條，已放棄 {queue['dead']} 條")
     
     # 如果有失敗的任務，返回錯誤碼
     if any(not r.get('success', False) for _, r in results):
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Telegram 頻道資源點獲取器 (Python 版本)
+
+只記錄最後處理的消息 ID（高水位標記），每次只解析比標記更新的消息，
+並以批量寫入更新 resources 集合。
+"""
+
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+import requests
+from firebase_admin import firestore
+from firebase_client import db
+from telegram_parser import CHANNEL_USERNAME, parse_channel_html, parse_telegram_post, resource_key
+
+# 高水位標記文檔
+CURSOR_DOC = ('_metadata', 'telegram_cursor')
+
+# Cloud Function (checkTelegramChannel) 記錄已處理消息 ID 的文檔
+PROCESSED_DOC = ('_metadata', 'telegram_processed')
+
+# Firestore 每個批量寫入最多 500 個操作
+BATCH_LIMIT = 400
+
+
+def fetch_channel_html(channel_username: str = CHANNEL_USERNAME, retries: int = 3) -> str:
+    """獲取頻道網頁版 HTML"""
+    channel_url = f"https://t.me/s/{channel_username}"
+
+    for attempt in range(1, retries + 1):
+        try:
+            print(f"📡 正在獲取 Telegram 頻道 (嘗試 {attempt}/{retries}): {channel_url}")
+            response = requests.get(channel_url, headers={
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+                'Accept-Language': 'zh-HK,zh;q=0.9,en;q=0.8',
+            }, timeout=30)
+            response.raise_for_status()
+            return response.text
+        except Exception as e:
+            print(f"❌ 獲取失敗 (嘗試 {attempt}/{retries}): {str(e)}")
+            if attempt == retries:
+                raise
+            # 遞增等待時間：2秒、4秒
+            time.sleep(attempt * 2)
+
+    return ''
+
+
+def get_last_message_id() -> int:
+    """讀取高水位標記；首次執行時以 Cloud Function 已處理的最大消息 ID 作為起點"""
+    doc = db.collection(CURSOR_DOC[0]).document(CURSOR_DOC[1]).get()
+    if doc.exists:
+        return int(doc.to_dict().get('lastMessageId', 0))
+
+    processed = db.collection(PROCESSED_DOC[0]).document(PROCESSED_DOC[1]).get()
+    if processed.exists:
+        message_ids = [int(message_id) for message_id in processed.to_dict().get('messageIds', [])]
+        if message_ids:
+            print(f"📊 沿用 Cloud Function 的處理記錄，從消息 #{max(message_ids)} 之後開始")
+            return max(message_ids)
+    return 0
+
+
+def find_existing_resource(parsed: Dict[str, Any]):
+    """查找相同地址和名稱的資源點"""
+    query = (
+        db.collection('resources')
+        .where('address', '==', parsed['address'])
+        .where('locationName', '==', parsed['locationName'])
+        .limit(1)
+    )
+    docs = list(query.stream())
+    return docs[0].reference if docs else None
+
+
+def fetch_and_add_telegram():
+    """主函數：獲取並更新 Telegram 資源點"""
+    try:
+        print(f"📰 開始獲取 Telegram 頻道: @{CHANNEL_USERNAME}")
+
+        last_message_id = get_last_message_id()
+        print(f"📊 最後處理的消息 ID: {last_message_id}")
+
+        messages = parse_channel_html(fetch_channel_html(), after_id=last_message_id)
+
+        if not messages:
+            print("ℹ️  沒有新消息")
+            return {
+                'success': True,
+                'added': 0,
+                'updated': 0,
+                'total': 0,
+                'message': '沒有新消息'
+            }
+
+        print(f"📝 開始處理 {len(messages)} 條新消息...\n")
+
+        # 同一批次中相同地點只寫入最新的一條
+        writes: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for message in messages:
+            parsed = parse_telegram_post(message['text'], message['messageId'])
+            if not parsed:
+                print(f"⏭️  消息 #{message['messageId']} 無法解析，跳過")
+                continue
+            parsed['sourceUrl'] = message['link']
+            parsed['updatedAt'] = message['date']
+            writes[resource_key(parsed)] = parsed
+            print(f"✅ 解析消息 #{message['messageId']}: {parsed['locationName']}")
+
+        added_count = 0
+        updated_count = 0
+        operations: List[Tuple[Any, Dict[str, Any], bool]] = []
+        for parsed in writes.values():
+            existing_ref = find_existing_resource(parsed)
+            if existing_ref:
+                operations.append((existing_ref, parsed, True))
+                updated_count += 1
+            else:
+                new_ref = db.collection('resources').document()
+                operations.append((new_ref, dict(parsed, timestamp=parsed['updatedAt']), False))
+                added_count += 1
+
+        # 批量寫入；高水位標記與最後一批一同提交
+        cursor_ref = db.collection(CURSOR_DOC[0]).document(CURSOR_DOC[1])
+        for start in range(0, max(len(operations), 1), BATCH_LIMIT):
+            batch = db.batch()
+            for ref, data, is_update in operations[start:start + BATCH_LIMIT]:
+                if is_update:
+                    batch.update(ref, data)
+                else:
+                    batch.set(ref, data)
+            if start + BATCH_LIMIT >= len(operations):
+                batch.set(cursor_ref, {
+                    'lastMessageId': messages[-1]['messageId'],
+                    'lastUpdate': firestore.SERVER_TIMESTAMP,
+                })
+            batch.commit()
+
+        message = (
+            f"處理完成: 新增 {added_count} 個資源點，更新 {updated_count} 個資源點，"
+            f"共處理 {len(messages)} 條消息"
+        )
+        print(f"✅ {message}")
+
+        return {
+            'success': True,
+            'added': added_count,
+            'updated': updated_count,
+            'total': len(messages),
+            'message': message
+        }
+
+    except Exception as e:
+        print(f"❌ 執行失敗: {str(e)}")
+        raise
+
+
+if __name__ == '__main__':
+    try:
+        result = fetch_and_add_telegram()
+        print(f"\n執行完成: {result['message']}")
+        sys.exit(0)
+    except Exception as e:
+        print(f"\n執行失敗: {str(e)}")
+        sys.exit(1)
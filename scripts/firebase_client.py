@@ -0,0 +1,42 @@
+"""
+Firebase 初始化
+
+所有 Python 腳本共用的 Firestore 客戶端。
+"""
+
+import os
+import firebase_admin
+from firebase_admin import credentials, firestore
+from dotenv import load_dotenv
+
+# 載入環境變量
+load_dotenv()
+
+# 初始化 Firebase
+if not firebase_admin._apps:
+    # 嘗試使用環境變量中的服務帳戶
+    cred_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
+    if cred_path and os.path.exists(cred_path):
+        cred = credentials.Certificate(cred_path)
+        firebase_admin.initialize_app(cred)
+    else:
+        # 嘗試使用項目根目錄的服務帳戶文件
+        default_cred_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'service-account-key.json')
+        if os.path.exists(default_cred_path):
+            cred = credentials.Certificate(default_cred_path)
+            firebase_admin.initialize_app(cred)
+        else:
+            try:
+                # 使用默認憑證（適用於 Cloud Functions 或已設置的環境）
+                firebase_admin.initialize_app()
+            except Exception as e:
+                print("❌ Firebase 初始化失敗！")
+                print("\n請設置 Firebase 憑證，方法如下：")
+                print("1. 下載服務帳戶密鑰文件（JSON）")
+                print("2. 設置環境變量：")
+                print("   export GOOGLE_APPLICATION_CREDENTIALS=/path/to/service-account-key.json")
+                print("   或將文件放在項目根目錄並命名為 'service-account-key.json'")
+                print("\n詳細說明：https://cloud.google.com/docs/authentication/external/set-up-adc")
+                raise
+
+db = firestore.client()
@@ -0,0 +1,353 @@
+"""
+新聞獲取管線核心
+
+各新聞來源只需繼承 NewsSource 並定義其 RSS Feed、關鍵詞及緊急判斷規則，
+獲取、去重、內容抓取、重試隊列及寫入 Firestore 的流程由本模組統一處理。
+"""
+
+import re
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Tuple
+import feedparser
+import requests
+from bs4 import BeautifulSoup
+from firebase_client import db
+from retry_queue import RetryQueue, RetryableError, KIND_FETCH, KIND_WRITE
+
+# 香港時區（用於沒有時區的日期）
+HK_TZ = timezone(timedelta(hours=8))
+
+# 無法獲取內容時的返回值
+CONTENT_UNAVAILABLE = "無法獲取新聞內容"
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+_retry_queue: Optional[RetryQueue] = None
+
+
+def get_retry_queue() -> RetryQueue:
+    """返回共用的重試隊列（首次使用時才打開）"""
+    global _retry_queue
+    if _retry_queue is None:
+        _retry_queue = RetryQueue()
+    return _retry_queue
+
+
+class NewsItem:
+    """一條新聞；published 始終為帶時區的 datetime"""
+
+    __slots__ = ('title', 'url', 'published', 'description', 'content')
+
+    def __init__(
+        self,
+        title: str,
+        url: str,
+        published: datetime,
+        description: str = '',
+        content: str = ''
+    ):
+        self.title = title
+        self.url = url
+        self.published = published
+        self.description = description
+        self.content = content
+
+    def to_dict(self) -> Dict[str, str]:
+        """轉換為可 JSON 序列化的字典（用於重試隊列）"""
+        return {
+            'title': self.title,
+            'url': self.url,
+            'published': self.published.isoformat(),
+            'description': self.description,
+            'content': self.content,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, str]) -> 'NewsItem':
+        """從 to_dict() 的結果還原"""
+        return cls(
+            title=data['title'],
+            url=data['url'],
+            published=datetime.fromisoformat(data['published']),
+            description=data.get('description', ''),
+            content=data.get('content', ''),
+        )
+
+
+def parse_rss_date(entry: Dict[str, Any]) -> datetime:
+    """解析 RSS 條目的發佈時間為帶時區的 datetime"""
+    try:
+        # feedparser 會將日期解析為 UTC 的 time.struct_time
+        parsed = entry.get('published_parsed')
+        if parsed:
+            return datetime(*parsed[:6], tzinfo=timezone.utc)
+        published = entry.get('published', '')
+        if published:
+            try:
+                # RFC 2822 格式，例如 "Thu, 27 Nov 2025 10:00:00 +0800"
+                dt = parsedate_to_datetime(published)
+            except (TypeError, ValueError):
+                # ISO 8601 格式，例如 "2025-11-27T10:00:00"
+                dt = datetime.fromisoformat(published.replace('Z', '+00:00'))
+            # 沒有時區的日期視為香港時間
+            return dt if dt.tzinfo else dt.replace(tzinfo=HK_TZ)
+    except (TypeError, ValueError):
+        pass
+    return datetime.now(timezone.utc)
+
+
+def clean_html(html: str) -> str:
+    """清理 HTML 標籤和實體"""
+    if not html:
+        return ""
+
+    soup = BeautifulSoup(html, 'html.parser')
+    text = soup.get_text()
+
+    # 清理多餘空格
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def fetch_news_content(url: str, selectors: Tuple[str, ...]) -> str:
+    """獲取新聞詳細內容"""
+    try:
+        response = requests.get(url, headers={'User-Agent': USER_AGENT}, timeout=10)
+        response.raise_for_status()
+
+        soup = BeautifulSoup(response.text, 'html.parser')
+
+        # 嘗試多種可能的內容選擇器
+        content = ""
+        for selector in selectors:
+            element = soup.select_one(selector)
+            if element:
+                content = element.get_text().strip()
+                break
+
+        # 如果找不到特定容器，嘗試獲取所有段落
+        if not content:
+            paragraphs = soup.find_all('p')
+            content = '\n\n'.join([
+                p.get_text().strip() for p in paragraphs
+                if len(p.get_text().strip()) > 20
+            ])
+
+        return content.strip() or CONTENT_UNAVAILABLE
+
+    except Exception as e:
+        print(f"獲取新聞內容時發生錯誤 ({url}): {str(e)}")
+        return CONTENT_UNAVAILABLE
+
+
+class NewsSource(ABC):
+    """新聞來源插件基類"""
+
+    # 重試隊列中使用的來源 ID
+    source_id = ''
+    # 日誌中顯示的名稱
+    name = ''
+    # 寫入 Firestore 的 source 字段
+    source_label = ''
+    rss_url = ''
+    # 非緊急新聞的標籤
+    default_tag = 'news'
+    content_selectors: Tuple[str, ...] = ('article', 'main')
+    # 是否同時以 URL 檢查重複
+    dedupe_by_url = False
+    # 描述短於此長度時獲取完整內容
+    min_description_length = 1
+
+    @abstractmethod
+    def is_fire_related(self, text: str) -> bool:
+        """檢查文本是否與火災相關"""
+
+    @abstractmethod
+    def is_urgent(self, item: NewsItem, content: str) -> bool:
+        """判斷是否為緊急新聞"""
+
+    def clean_description(self, description: str) -> str:
+        return description
+
+    def entry_url(self, entry: Dict[str, Any]) -> str:
+        """返回 RSS 條目的 URL"""
+        return entry.get('link', '').strip()
+
+    def parse_entry(self, entry: Dict[str, Any]) -> Optional[NewsItem]:
+        """將 RSS 條目轉換為 NewsItem；不相關的條目返回 None"""
+        title = entry.get('title', '').strip()
+        url = self.entry_url(entry)
+        description = entry.get('description', '').strip()
+
+        if not title or not url:
+            return None
+
+        if not (self.is_fire_related(title) or self.is_fire_related(description)):
+            print(f"⏭️  跳過不相關新聞: {title}")
+            return None
+
+        print(f"✅ 找到相關新聞: {title}")
+        return NewsItem(
+            title=title,
+            url=url,
+            published=parse_rss_date(entry),
+            description=self.clean_description(description),
+        )
+
+    def fetch_items(self) -> List[NewsItem]:
+        """獲取 RSS Feed 中的相關新聞"""
+        try:
+            print(f"📰 正在從 RSS Feed 獲取 {self.name}: {self.rss_url}")
+
+            feed = feedparser.parse(self.rss_url)
+
+            if feed.bozo:
+                print(f"⚠️  RSS 解析警告: {feed.bozo_exception}")
+
+            items = [item for item in map(self.parse_entry, feed.entries) if item]
+
+            print(f"✅ 從 RSS Feed 找到 {len(items)} 條相關新聞\n")
+            return items
+
+        except Exception as e:
+            print(f"❌ 獲取 RSS Feed 時發生錯誤: {str(e)}")
+            raise
+
+
+def announcement_exists(source: NewsSource, item: NewsItem) -> bool:
+    """檢查公告是否已存在"""
+    try:
+        announcements_ref = db.collection('announcements')
+        title_query = announcements_ref.where('title', '==', item.title).limit(1)
+        if len(list(title_query.stream())) > 0:
+            return True
+
+        if source.dedupe_by_url:
+            url_query = announcements_ref.where('url', '==', item.url).limit(1)
+            return len(list(url_query.stream())) > 0
+
+        return False
+    except Exception as e:
+        print(f"檢查公告是否存在時發生錯誤: {str(e)}")
+        return False
+
+
+def resolve_content(source: NewsSource, item: NewsItem) -> str:
+    """取得公告內容；無法取得任何內容時拋出 RetryableError"""
+    # 重試寫入時已包含之前獲取的內容
+    if item.content:
+        return item.content
+
+    content = item.description
+    if len(content) < source.min_description_length:
+        print(f"📄 正在獲取新聞內容: {item.title}")
+        full_content = fetch_news_content(item.url, source.content_selectors)
+        if full_content != CONTENT_UNAVAILABLE:
+            content = full_content
+        elif not content:
+            raise RetryableError(KIND_FETCH, item.to_dict(), CONTENT_UNAVAILABLE)
+
+    return content
+
+
+def store_announcement(source: NewsSource, item: NewsItem) -> bool:
+    """
+    寫入公告到 Firestore。
+
+    已存在時返回 False；獲取內容或寫入失敗時拋出 RetryableError。
+    """
+    if announcement_exists(source, item):
+        print(f"⏭️  跳過已存在的公告: {item.title}")
+        return False
+
+    content = resolve_content(source, item)
+    is_urgent = source.is_urgent(item, content)
+
+    announcement = {
+        'title': item.title,
+        'content': content,
+        'source': source.source_label,
+        'url': item.url,
+        'isUrgent': is_urgent,
+        'tag': 'urgent' if is_urgent else source.default_tag,
+        'timestamp': item.published
+    }
+
+    try:
+        db.collection('announcements').add(announcement)
+    except Exception as e:
+        # 保存已獲取的內容，重試時無需再次請求
+        item.content = content
+        raise RetryableError(KIND_WRITE, item.to_dict(), str(e)) from e
+
+    print(f"✅ 已添加公告: {item.title}")
+    return True
+
+
+def add_announcement(source: NewsSource, item: NewsItem) -> bool:
+    """添加公告到 Firestore，失敗時加入重試隊列"""
+    try:
+        return store_announcement(source, item)
+    except RetryableError as e:
+        print(f"添加公告時發生錯誤 ({item.title}): {str(e)}")
+        get_retry_queue().enqueue(source.source_id, item.url, e.kind, e.payload, str(e))
+        return False
+    except Exception as e:
+        print(f"添加公告時發生錯誤 ({item.title}): {str(e)}")
+        return False
+
+
+def run_source(source: NewsSource) -> Dict[str, Any]:
+    """主流程：先處理重試隊列，再獲取並添加新聞"""
+    try:
+        print(f"📰 開始獲取 {source.name}...")
+        retry_queue = get_retry_queue()
+
+        # 先處理重試隊列中到期的項目
+        retried = retry_queue.drain(
+            source.source_id,
+            lambda entry: store_announcement(source, NewsItem.from_dict(entry.payload))
+        )
+
+        # 獲取新聞
+        items = source.fetch_items()
+
+        added_count = 0
+        if items:
+            print(f"📝 開始處理 {len(items)} 條新聞...\n")
+        else:
+            print("ℹ️  沒有找到相關的新聞")
+
+        for item in items:
+            # 已在重試隊列中的項目由隊列處理
+            if retry_queue.contains(source.source_id, item.url):
+                print(f"⏭️  跳過重試隊列中的公告: {item.title}")
+                continue
+            # 已放棄重試的項目重新出現在 Feed 中時，重新正常處理
+            retry_queue.discard_dead(source.source_id, item.url)
+            if add_announcement(source, item):
+                added_count += 1
+            # 添加延遲避免請求過快
+            time.sleep(1)
+
+        queue_depth = retry_queue.depth(source.source_id)
+        message = (
+            f"處理完成: 新增 {added_count} 條公告，共處理 {len(items)} 條新聞，"
+            f"重試成功 {retried['succeeded']} 條，隊列待重試 {queue_depth['pending']} 條"
+        )
+        print(f"✅ {message}")
+
+        return {
+            'success': True,
+            'added': added_count,
+            'total': len(items),
+            'retried': retried,
+            'queue': queue_depth,
+            'message': message
+        }
+
+    except Exception as e:
+        print(f"❌ 執行失敗: {str(e)}")
+        raise
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+公告清理及歸檔工具
+
+將超過指定天數的公告導出為壓縮的 JSONL 歸檔文件（每頁一個文件），
+然後從 Firestore 中批量刪除，以控制 announcements 集合的大小及查詢成本。
+"""
+
+import os
+import sys
+import json
+import gzip
+import argparse
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+from firebase_client import db
+
+COLLECTION = 'announcements'
+
+# 默認保留 30 天內的公告
+DEFAULT_RETENTION_DAYS = 30
+
+# Firestore 每個批量寫入最多 500 個操作
+DEFAULT_BATCH_SIZE = 400
+
+DEFAULT_ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'archives')
+PROGRESS_FILENAME = 'prune_progress.json'
+
+
+def to_json_value(value: Any) -> Any:
+    """將 Firestore 字段轉換為可序列化的值"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, 'path'):
+        # DocumentReference
+        return value.path
+    return str(value)
+
+
+def load_progress(path: str) -> Dict[str, Any]:
+    """讀取上次未完成的進度"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_progress(path: str, progress: Dict[str, Any]) -> None:
+    """保存進度（先寫臨時文件再替換，避免中斷時損壞）"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(progress, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def archive_documents(archive_path: str, docs: List[Any]) -> None:
+    """將一頁文檔寫入獨立的壓縮 JSONL 文件（先寫臨時文件再替換，避免中斷時留下不完整的文件）"""
+    tmp_path = archive_path + '.tmp'
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        for doc in docs:
+            record = {'id': doc.id, **doc.to_dict()}
+            f.write(json.dumps(record, ensure_ascii=False, default=to_json_value) + '\n')
+    os.replace(tmp_path, archive_path)
+
+
+def page_archive_path(archive_dir: str, progress: Dict[str, Any]) -> str:
+    """返回下一頁的歸檔文件路徑"""
+    return os.path.join(archive_dir, f"{progress['archive_prefix']}-{progress['pages']:05d}.jsonl.gz")
+
+
+def delete_documents(doc_ids: List[str]) -> None:
+    """使用批量寫入刪除文檔"""
+    batch = db.batch()
+    collection_ref = db.collection(COLLECTION)
+    for doc_id in doc_ids:
+        batch.delete(collection_ref.document(doc_id))
+    batch.commit()
+
+
+def prune_announcements(
+    days: int = DEFAULT_RETENTION_DAYS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    archive_dir: str = DEFAULT_ARCHIVE_DIR,
+    dry_run: bool = False,
+    reset: bool = False,
+) -> Dict[str, Any]:
+    """主函數：歸檔並刪除舊公告"""
+    progress_path = os.path.join(archive_dir, PROGRESS_FILENAME)
+    progress: Dict[str, Any] = {}
+
+    if not dry_run:
+        os.makedirs(archive_dir, exist_ok=True)
+        if reset and os.path.exists(progress_path):
+            os.remove(progress_path)
+        progress = load_progress(progress_path)
+
+    if progress:
+        # 繼續上次未完成的清理，沿用相同的截止時間及歸檔文件名稱
+        cutoff = datetime.fromisoformat(progress['cutoff'])
+        print(f"🔄 繼續上次未完成的清理 (截止時間: {cutoff.isoformat()})")
+    else:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        progress = {
+            'cutoff': cutoff.isoformat(),
+            'archive_prefix': f"{COLLECTION}-{datetime.now().strftime('%Y%m%d-%H%M%S')}",
+            'pages': 0,
+            'pending': None,
+            'archived': 0,
+            'deleted': 0,
+        }
+
+    # 上次中斷的一頁：歸檔文件已完整寫入則直接刪除而不重複歸檔；
+    # 否則文檔仍在 Firestore 中，會在下面的掃描中重新歸檔
+    pending = progress['pending']
+    if pending:
+        if os.path.exists(pending['archive']):
+            print(f"🗑️  刪除上次已歸檔的 {len(pending['ids'])} 條公告...")
+            delete_documents(pending['ids'])
+            progress['archived'] += len(pending['ids'])
+            progress['deleted'] += len(pending['ids'])
+        progress['pending'] = None
+        save_progress(progress_path, progress)
+
+    mode = "（試運行，不會修改任何數據）" if dry_run else ""
+    print(f"📦 開始清理 {cutoff.isoformat()} 之前的公告{mode}...")
+
+    query = (
+        db.collection(COLLECTION)
+        .where('timestamp', '<', cutoff)
+        .order_by('timestamp')
+        .limit(batch_size)
+    )
+
+    scanned = 0
+    last_doc = None
+    while True:
+        page_query = query.start_after(last_doc) if last_doc else query
+        docs = list(page_query.stream())
+        if not docs:
+            break
+
+        scanned += len(docs)
+        last_doc = docs[-1]
+
+        if dry_run:
+            for doc in docs:
+                data = doc.to_dict()
+                print(f"  將歸檔: {doc.id} {data.get('title', '')}")
+            continue
+
+        # 先記錄進度，再寫入歸檔，最後刪除
+        pending = {
+            'ids': [doc.id for doc in docs],
+            'archive': page_archive_path(archive_dir, progress),
+        }
+        progress['pending'] = pending
+        progress['pages'] += 1
+        save_progress(progress_path, progress)
+
+        archive_documents(pending['archive'], docs)
+        delete_documents(pending['ids'])
+
+        progress['archived'] += len(docs)
+        progress['deleted'] += len(docs)
+        progress['pending'] = None
+        save_progress(progress_path, progress)
+
+        print(f"✅ 已歸檔並刪除 {progress['deleted']} 條公告")
+
+    if dry_run:
+        message = f"試運行完成: 共有 {scanned} 條公告符合清理條件"
+    else:
+        os.remove(progress_path)
+        message = (
+            f"清理完成: 歸檔 {progress['archived']} 條，刪除 {progress['deleted']} 條公告"
+            + (f"，歸檔文件: {os.path.join(archive_dir, progress['archive_prefix'])}-*.jsonl.gz"
+               if progress['archived'] else "")
+        )
+    print(f"✅ {message}")
+
+    return {
+        'success': True,
+        'scanned': scanned,
+        'archived': progress.get('archived', 0),
+        'deleted': progress.get('deleted', 0),
+        'message': message
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='歸檔並刪除舊公告')
+    parser.add_argument('--days', type=int, default=DEFAULT_RETENTION_DAYS,
+                        help=f'保留最近多少天的公告（默認 {DEFAULT_RETENTION_DAYS}）')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'每頁讀取及批量刪除的數量（最多 500，默認 {DEFAULT_BATCH_SIZE}）')
+    parser.add_argument('--archive-dir', default=DEFAULT_ARCHIVE_DIR,
+                        help='歸檔文件及進度文件的目錄')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='只列出符合條件的公告，不歸檔或刪除')
+    parser.add_argument('--reset', action='store_true',
+                        help='放棄上次未完成的進度，重新開始')
+    args = parser.parse_args()
+    if not 0 < args.batch_size <= 500:
+        parser.error('--batch-size 必須在 1 至 500 之間')
+    return args
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    try:
+        result = prune_announcements(
+            days=args.days,
+            batch_size=args.batch_size,
+            archive_dir=args.archive_dir,
+            dry_run=args.dry_run,
+            reset=args.reset,
+        )
+        print(f"\n執行完成: {result['message']}")
+        sys.exit(0)
+    except Exception as e:
+        print(f"\n執行失敗: {str(e)}")
+        sys.exit(1)
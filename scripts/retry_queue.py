@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+本地重試隊列 (SQLite)
+
+用於保存獲取新聞內容失敗或寫入 Firestore 失敗的項目，
+在下次執行時以指數退避的方式重試，避免項目遺失或以空白內容寫入。
+"""
+
+import os
+import sys
+import json
+import argparse
+import sqlite3
+import time
+from typing import Any, Callable, Dict, List, Optional
+from dotenv import load_dotenv
+
+# 默認隊列文件位置（可通過 RETRY_QUEUE_PATH 環境變量覆蓋）
+DEFAULT_QUEUE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'retry_queue.db')
+
+# 重試參數：等待時間由 5 分鐘起每次加倍，最長 12 小時；
+# 共嘗試 10 次，重試窗口約 33 小時
+DEFAULT_MAX_ATTEMPTS = 10
+DEFAULT_BASE_DELAY = 300       # 第一次重試前等待 5 分鐘
+DEFAULT_MAX_DELAY = 12 * 3600  # 最長等待 12 小時
+DEFAULT_DRAIN_LIMIT = 50
+
+# 失敗類型
+KIND_FETCH = 'fetch'
+KIND_WRITE = 'write'
+
+STATUS_PENDING = 'pending'
+STATUS_DEAD = 'dead'
+
+
+class RetryableError(Exception):
+    """可重試的錯誤，附帶需要重新處理的項目數據"""
+
+    def __init__(self, kind: str, payload: Dict[str, Any], message: str):
+        super().__init__(message)
+        self.kind = kind
+        self.payload = payload
+
+
+class RetryEntry:
+    """隊列中的一個待重試項目"""
+
+    __slots__ = ('id', 'source', 'key', 'kind', 'payload', 'attempts', 'last_error')
+
+    def __init__(self, row: sqlite3.Row):
+        self.id = row['id']
+        self.source = row['source']
+        self.key = row['item_key']
+        self.kind = row['kind']
+        self.payload = json.loads(row['payload'])
+        self.attempts = row['attempts']
+        self.last_error = row['last_error']
+
+
+class RetryQueue:
+    """以 SQLite 保存的持久化重試隊列"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ):
+        # 在創建時才讀取環境變量，確保 .env 已經載入
+        self.path = path or os.getenv('RETRY_QUEUE_PATH', DEFAULT_QUEUE_PATH)
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS retry_queue (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    source TEXT NOT NULL,
+                    item_key TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    last_error TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    created_at REAL NOT NULL,
+                    UNIQUE (source, item_key)
+                )
+            """)
+            self.conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_retry_queue_due
+                ON retry_queue (source, status, next_attempt_at)
+            """)
+
+    def backoff_delay(self, attempts: int) -> float:
+        """計算第 N 次失敗後的等待時間（指數退避）"""
+        return min(self.base_delay * (2 ** max(attempts - 1, 0)), self.max_delay)
+
+    def enqueue(self, source: str, key: str, kind: str, payload: Dict[str, Any], error: str) -> None:
+        """加入隊列；如項目已在隊列中，只更新其數據而不重置嘗試次數"""
+        now = time.time()
+        with self.conn:
+            self.conn.execute("""
+                INSERT INTO retry_queue
+                    (source, item_key, kind, payload, attempts, next_attempt_at, last_error, status, created_at)
+                VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?)
+                ON CONFLICT (source, item_key) DO UPDATE SET
+                    kind = excluded.kind,
+                    payload = excluded.payload,
+                    last_error = excluded.last_error
+            """, (
+                source, key, kind, json.dumps(payload, ensure_ascii=False),
+                now + self.backoff_delay(1), error, STATUS_PENDING, now
+            ))
+        print(f"🔁 已加入重試隊列 ({kind}): {key}")
+
+    def contains(self, source: str, key: str) -> bool:
+        """檢查項目是否正在等待重試"""
+        row = self.conn.execute(
+            "SELECT 1 FROM retry_queue WHERE source = ? AND item_key = ? AND status = ?",
+            (source, key, STATUS_PENDING)
+        ).fetchone()
+        return row is not None
+
+    def discard_dead(self, source: str, key: str) -> None:
+        """移除已放棄的項目（項目重新出現在 Feed 中時再次正常處理）"""
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM retry_queue WHERE source = ? AND item_key = ? AND status = ?",
+                (source, key, STATUS_DEAD)
+            )
+
+    def requeue_dead(self, source: Optional[str] = None) -> int:
+        """將已放棄的項目重新加入隊列，立即可重試"""
+        query = """
+            UPDATE retry_queue SET status = ?, attempts = 1, next_attempt_at = ?
+            WHERE status = ?
+        """
+        params: tuple = (STATUS_PENDING, time.time(), STATUS_DEAD)
+        if source:
+            query += " AND source = ?"
+            params += (source,)
+        with self.conn:
+            return self.conn.execute(query, params).rowcount
+
+    def purge_dead(self, source: Optional[str] = None) -> int:
+        """刪除已放棄的項目"""
+        query = "DELETE FROM retry_queue WHERE status = ?"
+        params: tuple = (STATUS_DEAD,)
+        if source:
+            query += " AND source = ?"
+            params += (source,)
+        with self.conn:
+            return self.conn.execute(query, params).rowcount
+
+    def due(self, source: str, limit: int = DEFAULT_DRAIN_LIMIT) -> List[RetryEntry]:
+        """取出已到重試時間的項目"""
+        rows = self.conn.execute("""
+            SELECT * FROM retry_queue
+            WHERE source = ? AND status = ? AND next_attempt_at <= ?
+            ORDER BY next_attempt_at
+            LIMIT ?
+        """, (source, STATUS_PENDING, time.time(), limit)).fetchall()
+        return [RetryEntry(row) for row in rows]
+
+    def drain(
+        self,
+        source: str,
+        handler: Callable[[RetryEntry], Any],
+        limit: int = DEFAULT_DRAIN_LIMIT,
+    ) -> Dict[str, int]:
+        """
+        批量重試已到期的項目。
+
+        handler 正常返回即視為成功並從隊列移除；拋出異常則增加嘗試次數，
+        超過最大嘗試次數的項目會標記為放棄。
+        """
+        entries = self.due(source, limit)
+        if not entries:
+            return {'succeeded': 0, 'failed': 0, 'dead': 0}
+
+        print(f"🔁 正在重試 {len(entries)} 個隊列項目...")
+
+        done_ids = []
+        failures = []
+        dead_count = 0
+        now = time.time()
+
+        for entry in entries:
+            try:
+                handler(entry)
+                done_ids.append((entry.id,))
+            except Exception as e:
+                attempts = entry.attempts + 1
+                if attempts >= self.max_attempts:
+                    status = STATUS_DEAD
+                    dead_count += 1
+                    print(f"⚠️  已放棄重試 ({attempts} 次): {entry.key}")
+                else:
+                    status = STATUS_PENDING
+                    print(f"❌ 重試失敗 ({attempts}/{self.max_attempts}): {entry.key} - {str(e)}")
+                # 保存最新的失敗類型及數據（例如重試時已獲取的內容）
+                kind, payload = None, None
+                if isinstance(e, RetryableError):
+                    kind = e.kind
+                    payload = json.dumps(e.payload, ensure_ascii=False)
+                failures.append((
+                    attempts, now + self.backoff_delay(attempts), str(e), status,
+                    kind, payload, entry.id
+                ))
+
+        # 在同一個事務中提交所有結果
+        with self.conn:
+            self.conn.executemany("DELETE FROM retry_queue WHERE id = ?", done_ids)
+            self.conn.executemany("""
+                UPDATE retry_queue
+                SET attempts = ?, next_attempt_at = ?, last_error = ?, status = ?,
+                    kind = COALESCE(?, kind), payload = COALESCE(?, payload)
+                WHERE id = ?
+            """, failures)
+
+        return {
+            'succeeded': len(done_ids),
+            'failed': len(failures) - dead_count,
+            'dead': dead_count,
+        }
+
+    def depth(self, source: Optional[str] = None) -> Dict[str, int]:
+        """返回隊列深度（待重試及已放棄的數量）"""
+        query = "SELECT status, COUNT(*) AS n FROM retry_queue"
+        params: tuple = ()
+        if source:
+            query += " WHERE source = ?"
+            params = (source,)
+        query += " GROUP BY status"
+
+        counts = {STATUS_PENDING: 0, STATUS_DEAD: 0}
+        for row in self.conn.execute(query, params):
+            counts[row['status']] = row['n']
+        return counts
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='查看及管理重試隊列')
+    parser.add_argument('--source', help='只處理指定來源（例如 gov、rthk）')
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument('--requeue', action='store_true',
+                        help='將已放棄的項目重新加入隊列')
+    action.add_argument('--purge', action='store_true',
+                        help='刪除已放棄的項目')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    # 載入環境變量（RETRY_QUEUE_PATH 可能在 .env 中設置）
+    load_dotenv()
+    args = parse_args()
+    queue = RetryQueue()
+
+    if args.requeue:
+        print(f"🔁 已重新加入隊列: {queue.requeue_dead(args.source)} 項")
+    elif args.purge:
+        print(f"🗑️  已刪除已放棄的項目: {queue.purge_dead(args.source)} 項")
+
+    # 顯示隊列狀態
+    query = "SELECT source, status, COUNT(*) AS n FROM retry_queue"
+    params: tuple = ()
+    if args.source:
+        query += " WHERE source = ?"
+        params = (args.source,)
+    rows = queue.conn.execute(
+        query + " GROUP BY source, status ORDER BY source", params
+    ).fetchall()
+
+    print(f"重試隊列: {queue.path}")
+    if not rows:
+        print("ℹ️  隊列為空")
+    for row in rows:
+        label = '待重試' if row['status'] == STATUS_PENDING else '已放棄'
+        print(f"  {row['source']}: {label} {row['n']} 項")
+    queue.close()
+    sys.exit(0)
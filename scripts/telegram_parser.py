@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Telegram 貼文解析工具 (Python 版本)
+
+解析 Telegram 公開頻道網頁版 (t.me/s/...) 的 HTML，
+並從銀河系哨俠頻道的貼文中提取物資收集站和庇護中心信息。
+不依賴 Firebase，可直接使用 HTML 文件離線測試：
+
+    python3 scripts/telegram_parser.py scripts/fixtures/telegram_channel.html
+"""
+
+import sys
+import re
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+from bs4 import BeautifulSoup
+
+CHANNEL_USERNAME = 'universalsentinelsinblack'
+SOURCE_NAME = '銀河系哨俠頻道'
+
+# 地址模式
+ADDRESS_PATTERNS = [
+    re.compile(r'([大埔|新界|香港].*?(?:街|路|道|邨|村|中心|會堂|廣場|大廈|樓|號))'),
+    re.compile(r'(.*?(?:社區中心|社區會堂|體育館|活動中心|中心|會堂))'),
+]
+
+# 找不到完整地址時使用的地點名稱模式
+LOCATION_PATTERNS = [
+    re.compile(r'([大埔|新界].*?(?:中心|會堂|體育館|活動中心))'),
+]
+
+# 地圖連結模式
+MAP_LINK_PATTERNS = [
+    re.compile(r'(https?://\S*(?:maps\.google|goo\.gl/maps|maps\.app\.goo\.gl)\S*)'),
+    re.compile(r'(https?://\S*(?:openstreetmap|osm)\S*)'),
+]
+
+# 聯絡方式模式
+PHONE_PATTERN = re.compile(r'(\d{4}\s?\d{4}|\d{8})')
+CONTACT_PATTERNS = [
+    re.compile(r'聯絡[：:]\s*([^\n]+)'),
+    re.compile(r'電話[：:]\s*([^\n]+)'),
+    re.compile(r'Contact[：:]\s*([^\n]+)', re.IGNORECASE),
+]
+
+# 結構化物資需求模式
+NEEDS_PATTERNS = [
+    re.compile(r'需要[：:]\s*([^\n]+)'),
+    re.compile(r'物資[：:]\s*([^\n]+)'),
+    re.compile(r'需求[：:]\s*([^\n]+)'),
+]
+NEEDS_SEPARATOR = re.compile(r'[、,，]')
+WHITESPACE = re.compile(r'\s+')
+
+# 地點名稱前綴
+LOCATION_PREFIX_PATTERNS = [
+    re.compile(r'^[⚠️⚠️⚠️]*\s*'),
+    re.compile(r'^號外\s*'),
+    re.compile(r'^注意\s*'),
+]
+
+# 常見物資關鍵字
+SUPPLY_ITEM_KEYWORDS = (
+    '水', '樽裝水', '食水', '飲用水',
+    '口罩', 'N95', '外科口罩',
+    '毛巾', '毛毯', '被', '毯',
+    '食物', '乾糧', '餅乾', '麵包',
+    '生理鹽水', '洗眼水', '眼藥水',
+    '濕紙巾', '紙巾',
+    '充電器', '充電寶', '行動電源',
+    '手電筒', '電筒',
+)
+
+# 庇護中心關鍵字
+SHELTER_KEYWORDS = (
+    '庇護', '避難', '臨時住宿', '住宿', '過夜',
+    '休息', '暫住', '收容',
+)
+
+# 物資收集站關鍵字
+SUPPLY_STATION_KEYWORDS = (
+    '物資收集', '收集站', '收集點', '捐贈',
+    '物資', '收集', '捐',
+)
+
+FULL_KEYWORDS = ('已滿', '滿額', '額滿')
+CLOSED_KEYWORDS = ('已關閉', '關閉', '停止')
+
+
+def extract_address(text: str) -> str:
+    """從文本中提取地址"""
+    for pattern in ADDRESS_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            return match.group(0).strip()
+
+    # 如果找不到完整地址，嘗試提取地點名稱
+    for pattern in LOCATION_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            return match.group(0).strip()
+
+    return ''
+
+
+def extract_map_link(text: str, address: str) -> str:
+    """從文本中提取 Google Maps 連結"""
+    for pattern in MAP_LINK_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            return match.group(0).strip()
+
+    # 如果沒有找到地圖連結，根據地址生成 Google Maps 搜尋連結
+    if address:
+        return f"https://www.google.com/maps/search/?api=1&query={quote(address)}"
+
+    return ''
+
+
+def extract_contact(text: str) -> str:
+    """從文本中提取聯絡方式"""
+    match = PHONE_PATTERN.search(text)
+    if match:
+        return re.sub(r'\s', '', match.group(0))
+
+    for pattern in CONTACT_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            return match.group(1).strip()
+
+    return ''
+
+
+def extract_needs(text: str) -> List[str]:
+    """從文本中提取需要的物資"""
+    needs = [keyword for keyword in SUPPLY_ITEM_KEYWORDS if keyword in text]
+
+    # 嘗試從結構化文本中提取
+    for pattern in NEEDS_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            items = NEEDS_SEPARATOR.split(match.group(1))
+            needs.extend(item.strip() for item in items if item.strip())
+
+    # 去重（保留順序）
+    return list(dict.fromkeys(needs))
+
+
+def determine_category(text: str) -> str:
+    """判斷是物資收集站 (supply) 還是庇護中心 (shelter)"""
+    lower_text = text.lower()
+
+    shelter_count = sum(1 for keyword in SHELTER_KEYWORDS if keyword in lower_text)
+    supply_count = sum(1 for keyword in SUPPLY_STATION_KEYWORDS if keyword in lower_text)
+
+    # 如果明確提到庇護相關，優先判斷為庇護中心
+    if shelter_count > 0 and shelter_count >= supply_count:
+        return 'shelter'
+
+    return 'supply'
+
+
+def determine_status(text: str) -> str:
+    """判斷狀態 (open / closed / full)"""
+    lower_text = text.lower()
+
+    if any(keyword in lower_text for keyword in FULL_KEYWORDS):
+        return 'full'
+
+    if any(keyword in lower_text for keyword in CLOSED_KEYWORDS):
+        return 'closed'
+
+    return 'open'
+
+
+def extract_location_name(text: str, address: str) -> str:
+    """提取地點名稱"""
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    if lines:
+        cleaned = lines[0]
+        # 移除常見的前綴
+        for pattern in LOCATION_PREFIX_PATTERNS:
+            cleaned = pattern.sub('', cleaned)
+        cleaned = cleaned.strip()
+
+        if 0 < len(cleaned) < 50:
+            return cleaned
+
+    # 如果第一行太長，使用地址
+    if address:
+        return address
+
+    return '未命名地點'
+
+
+def parse_telegram_post(
+    text: str,
+    message_id: Optional[int] = None,
+    channel_username: str = CHANNEL_USERNAME
+) -> Optional[Dict[str, Any]]:
+    """解析 Telegram 貼文"""
+    if not text or not text.strip():
+        return None
+
+    address = extract_address(text)
+    location_name = extract_location_name(text, address)
+
+    # 如果沒有提取到基本信息，跳過
+    if not location_name and not address:
+        return None
+
+    return {
+        'locationName': location_name or address or '未命名地點',
+        'address': address or location_name or '',
+        'mapLink': extract_map_link(text, address),
+        'category': determine_category(text),
+        'status': determine_status(text),
+        'needs': extract_needs(text),
+        'contact': extract_contact(text),
+        'source': SOURCE_NAME,
+        'sourceUrl': f"https://t.me/{channel_username}/{message_id or ''}",
+    }
+
+
+def resource_key(parsed: Dict[str, Any]) -> Tuple[str, str]:
+    """資源點的去重鍵（與 Cloud Function 相同，按地址及地點名稱）"""
+    return (parsed['address'], parsed['locationName'])
+
+
+def parse_channel_html(
+    html: str,
+    after_id: int = 0,
+    channel_username: str = CHANNEL_USERNAME
+) -> List[Dict[str, Any]]:
+    """
+    從頻道網頁版 HTML 中提取消息。
+
+    只處理 ID 大於 after_id 的消息，按 ID 由舊到新排序。
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    messages = []
+
+    for element in soup.select('.tgme_widget_message[data-post]'):
+        try:
+            message_id = int(element['data-post'].rsplit('/', 1)[-1])
+        except ValueError:
+            continue
+
+        # 已處理的消息不需要再解析內容
+        if message_id <= after_id:
+            continue
+
+        text_element = element.select_one('.tgme_widget_message_text')
+        if not text_element:
+            continue
+
+        # 與 Cloud Function 的 scrapeTelegramChannel 相同：標籤替換為空格並合併空白，
+        # 確保同一貼文解析出相同的地點名稱及地址，不會與現有資源點重複
+        text = WHITESPACE.sub(' ', text_element.get_text(' ')).strip()
+        if not text:
+            continue
+
+        time_element = element.select_one('time[datetime]')
+        try:
+            date = datetime.fromisoformat(time_element['datetime'])
+        except (TypeError, ValueError):
+            date = datetime.now(timezone.utc)
+
+        messages.append({
+            'messageId': message_id,
+            'text': text,
+            'date': date,
+            'link': f"https://t.me/{channel_username}/{message_id}",
+        })
+
+    messages.sort(key=lambda message: message['messageId'])
+    return messages
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("用法: python3 scripts/telegram_parser.py <頻道 HTML 文件> [起始消息 ID]")
+        sys.exit(1)
+
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        channel_html = f.read()
+    after = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+
+    for message in parse_channel_html(channel_html, after):
+        parsed = parse_telegram_post(message['text'], message['messageId'])
+        print(f"#{message['messageId']} ({message['date'].isoformat()})")
+        print(json.dumps(parsed, ensure_ascii=False, indent=2))
+    sys.exit(0)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+telegram_parser 的離線檢查（使用 fixtures/telegram_channel.html）
+
+    python3 scripts/test_telegram_parser.py
+"""
+
+import os
+import unittest
+from telegram_parser import parse_channel_html, parse_telegram_post, resource_key
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'telegram_channel.html')
+
+
+class ParseChannelHtmlTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with open(FIXTURE_PATH, 'r', encoding='utf-8') as f:
+            cls.html = f.read()
+
+    def parse(self, after_id=0):
+        return {
+            message['messageId']: parse_telegram_post(message['text'], message['messageId'])
+            for message in parse_channel_html(self.html, after_id)
+        }
+
+    def test_messages_in_ascending_order_without_photo_only_post(self):
+        ids = [message['messageId'] for message in parse_channel_html(self.html)]
+        self.assertEqual(ids, [1201, 1202, 1204])
+
+    def test_after_id_skips_processed_messages(self):
+        ids = [message['messageId'] for message in parse_channel_html(self.html, after_id=1201)]
+        self.assertEqual(ids, [1202, 1204])
+        self.assertEqual(parse_channel_html(self.html, after_id=1204), [])
+
+    def test_keys_match_cloud_function(self):
+        posts = self.parse()
+        # 與 scrapeTelegramChannel + parseTelegramPost 的結果相同
+        self.assertEqual(resource_key(posts[1202]), ('廣福社區會堂', '廣福社區會堂'))
+        self.assertEqual(resource_key(posts[1201]), ('大埔墟體育館', '大埔墟體育館'))
+
+    def test_update_post_shares_key_and_changes_status(self):
+        posts = self.parse()
+        self.assertEqual(resource_key(posts[1201]), resource_key(posts[1204]))
+        self.assertEqual(posts[1201]['status'], 'open')
+        self.assertEqual(posts[1204]['status'], 'full')
+
+    def test_category(self):
+        posts = self.parse()
+        self.assertEqual(posts[1201]['category'], 'supply')
+        self.assertEqual(posts[1202]['category'], 'shelter')
+
+
+if __name__ == '__main__':
+    unittest.main()